@@ -9,3 +9,13 @@ YELP_API_KEY = os.environ.get("YELP_API_KEY")
 if YELP_API_KEY is None:
     raise ValueError("YELP_API_KEY environment variable is not set. Please set it in your .env file.")
 YELP_API_BASE_URL = "https://api.yelp.com/v3"
+
+# Profiling Configuration (opt-in)
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0.01"))  # Fraction of requests sampled (0 to 1)
+PROFILING_SLOW_THRESHOLD_MS = float(os.environ.get("PROFILING_SLOW_THRESHOLD_MS", "1000"))  # Requests slower than this are always traced
+PROFILING_INTERVAL_MS = float(os.environ.get("PROFILING_INTERVAL_MS", "5"))  # Stack sampling interval for sampled requests
+PROFILING_BACKGROUND_INTERVAL_MS = float(os.environ.get("PROFILING_BACKGROUND_INTERVAL_MS", "20"))  # Stack sampling interval for all other requests
+PROFILING_TRACE_DIR = os.environ.get("PROFILING_TRACE_DIR", "profiles")
+PROFILING_MAX_TRACES = int(os.environ.get("PROFILING_MAX_TRACES", "200"))  # Oldest traces are deleted beyond this
+PROFILING_ADMIN_KEY = os.environ.get("PROFILING_ADMIN_KEY")
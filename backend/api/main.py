@@ -1,8 +1,16 @@
-from fastapi import FastAPI, HTTPException, Header, Body
+from fastapi import FastAPI, HTTPException, Header, Body, Query, Request, BackgroundTasks
 from .services.yelp import search_restaurants
 from .services.favorites import get_favorites, add_favorite, remove_favorite, get_favorite_counts
 from .services.comments import get_comments, add_comment
+from .services.trending import get_trending, record_regions
+from .services.search_page import get_search_page, DEFAULT_COMMENTS_LIMIT
 from .models import SearchCriteria, User
+from .config import (
+    PROFILING_ENABLED, PROFILING_SAMPLE_RATE, PROFILING_SLOW_THRESHOLD_MS,
+    PROFILING_INTERVAL_MS, PROFILING_BACKGROUND_INTERVAL_MS, PROFILING_TRACE_DIR,
+    PROFILING_MAX_TRACES, PROFILING_ADMIN_KEY
+)
+from .utils.profiling import Profiler, ProfiledRoute
 from .authentication.validation import create_user, login_user, change_password as change_pwd
 from typing import Dict, Any
 
@@ -16,12 +24,50 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+# Opt-in request profiling
+profiler = None
+if PROFILING_ENABLED:
+    profiler = Profiler(
+        sample_rate=PROFILING_SAMPLE_RATE,
+        slow_threshold_ms=PROFILING_SLOW_THRESHOLD_MS,
+        interval_ms=PROFILING_INTERVAL_MS,
+        background_interval_ms=PROFILING_BACKGROUND_INTERVAL_MS,
+        trace_dir=PROFILING_TRACE_DIR,
+        max_traces=PROFILING_MAX_TRACES,
+        admin_key=PROFILING_ADMIN_KEY,
+    )
+    # Must be set before any route is declared so endpoint threads can be sampled
+    app.router.route_class = ProfiledRoute
+
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        """Trace the request when profiling is enabled."""
+        with profiler.trace(request.method, request.url.path) as trace:
+            trace.status_code = 500
+            response = await call_next(request)
+            trace.status_code = response.status_code
+        return response
+
 # Yelp API endpoints
 @app.post("/search")
-def search(criteria: SearchCriteria):
+def search(criteria: SearchCriteria, background_tasks: BackgroundTasks):
     """Endpoint to search for restaurants."""
     logger.info(f"Searching for {criteria.term}")
     result, status_code = search_restaurants(criteria)
+    if "error" in result:
+        raise HTTPException(status_code=status_code, detail=result["error"])
+    background_tasks.add_task(record_regions, result.get("businesses", []))
+    return result
+
+@app.post("/search/page")
+def search_page(
+    criteria: SearchCriteria,
+    apiKey: str = Header(None),
+    comments_limit: int = Query(DEFAULT_COMMENTS_LIMIT),
+):
+    """Endpoint to search for restaurants annotated with favorites and comments in one call."""
+    logger.info(f"Searching page for {criteria.term}")
+    result, status_code = get_search_page(criteria, apiKey, comments_limit)
     if "error" in result:
         raise HTTPException(status_code=status_code, detail=result["error"])
     return result
@@ -123,6 +169,32 @@ def add_restaurant_comment(
     """Add a comment to a restaurant."""
     logger.info(f"Adding comment to restaurant {restaurant_id}")
     result, status_code = add_comment(restaurant_id, content, apiKey)
+    if "error" in result:
+        raise HTTPException(status_code=status_code, detail=result["error"])
+    return result
+
+# Trending endpoints
+@app.get("/trending")
+def get_trending_restaurants(
+    location: str = Query(None),
+    window: str = Query("day"),
+    limit: int = Query(20),
+):
+    """Get the top trending restaurants in a location."""
+    logger.info(f"Getting trending restaurants for {location} over the last {window}")
+    result, status_code = get_trending(location, window, limit)
+    if "error" in result:
+        raise HTTPException(status_code=status_code, detail=result["error"])
+    return result
+
+# Admin endpoints
+@app.get("/admin/slow_requests")
+def get_slow_requests(limit: int = Query(10), adminKey: str = Header(None)):
+    """Get the slowest recent requests with their SQL and Yelp breakdown."""
+    if profiler is None:
+        raise HTTPException(status_code=404, detail="Profiling is not enabled.")
+    logger.info(f"Getting the {limit} slowest recent requests")
+    result, status_code = profiler.get_slow_requests(limit, adminKey)
     if "error" in result:
         raise HTTPException(status_code=status_code, detail=result["error"])
     return result
\ No newline at end of file
@@ -2,6 +2,7 @@ import sqlite3
 import logging
 from ..utils.db_utils import execute_query, get_db_connection
 from ..utils.auth_utils import authenticate_api_key
+from .trending import record_event
 
 logging.basicConfig(
     level=logging.INFO,
@@ -35,6 +36,49 @@ def get_comments(restaurant_id):
         logger.error(f"Database error in get_comments: {e}")
         return {"error": str(e)}, 500
 
+def get_comments_for_restaurants(restaurant_ids, limit):
+    """Get the most recent comments and the comment count for each restaurant in one query."""
+    try:
+        if not restaurant_ids:
+            return {"comments": {}, "counts": {}}, 200
+        
+        # Build placeholders for the SQL query
+        placeholders = ','.join(['?'] * len(restaurant_ids))
+        
+        # Rank comments per restaurant so only the first page of each is returned
+        query = f"""
+            SELECT id, restaurant_id, content, commented_at, username, comment_count
+            FROM (
+                SELECT r.id, r.restaurant_id, r.content, r.commented_at, u.username,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY r.restaurant_id ORDER BY r.commented_at DESC, r.id DESC
+                       ) AS position,
+                       COUNT(*) OVER (PARTITION BY r.restaurant_id) AS comment_count
+                FROM review r
+                JOIN user u ON r.user_id = u.id
+                WHERE r.restaurant_id IN ({placeholders})
+            )
+            WHERE position <= ?
+            ORDER BY restaurant_id, position
+        """
+        
+        rows = execute_query(query, (*restaurant_ids, limit), fetch_all=True)
+        comments = {restaurant_id: [] for restaurant_id in restaurant_ids}
+        counts = {restaurant_id: 0 for restaurant_id in restaurant_ids}
+        for row in rows:
+            comments[row["restaurant_id"]].append({
+                "id": row["id"],
+                "content": row["content"],
+                "commented_at": row["commented_at"],
+                "username": row["username"]
+            })
+            counts[row["restaurant_id"]] = row["comment_count"]
+        
+        return {"comments": comments, "counts": counts}, 200
+    except sqlite3.Error as e:
+        logger.error(f"Database error in get_comments_for_restaurants: {e}")
+        return {"error": str(e)}, 500
+
 def add_comment(restaurant_id, content, api_key):
     """Add a new comment for a restaurant."""
     conn = None
@@ -73,6 +117,8 @@ def add_comment(restaurant_id, content, api_key):
             logger.error("Failed to retrieve the newly created comment")
             return {"error": "Failed to retrieve the newly created comment"}, 500
         
+        record_event(restaurant_id, "comment")
+        
         return {
             "id": comment["id"],
             "content": comment["content"],
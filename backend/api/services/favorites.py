@@ -1,6 +1,7 @@
 import sqlite3
 import logging
 from .yelp import get_restaurant_by_id
+from .trending import record_event, region_of
 from ..utils.db_utils import execute_query, get_user_id_by_api_key
 
 logging.basicConfig(
@@ -67,6 +68,7 @@ def add_favorite(restaurant, api_key):
             (user_id, restaurant_id),
             commit=True
         )
+        record_event(restaurant_id, "favorite", region=region_of(restaurant), user_id=user_id)
         
         return {"message": "Restaurant added to favorites."}, 201
     except sqlite3.Error as db_error:
@@ -124,3 +126,26 @@ def get_favorite_counts(restaurant_ids):
     except sqlite3.Error as db_error:
         logger.error(f"Database error in get_favorite_counts: {db_error}")
         return {"error": str(db_error)}, 500
+
+def get_favorite_flags(restaurant_ids, user_id):
+    """Get whether a user has favorited each of the given restaurants."""
+    try:
+        if not restaurant_ids:
+            return {"favorites": {}}, 200
+        
+        # Build placeholders for the SQL query
+        placeholders = ','.join(['?'] * len(restaurant_ids))
+        
+        query = f"""
+            SELECT restaurant_id 
+            FROM favorite 
+            WHERE user_id = ? AND restaurant_id IN ({placeholders})
+        """
+        
+        rows = execute_query(query, (user_id, *restaurant_ids), fetch_all=True)
+        favorited = {row['restaurant_id'] for row in rows}
+        
+        return {"favorites": {restaurant_id: restaurant_id in favorited for restaurant_id in restaurant_ids}}, 200
+    except sqlite3.Error as db_error:
+        logger.error(f"Database error in get_favorite_flags: {db_error}")
+        return {"error": str(db_error)}, 500
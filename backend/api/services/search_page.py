@@ -0,0 +1,93 @@
+import sqlite3
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from .yelp import search_restaurants
+from .favorites import get_favorite_counts, get_favorite_flags
+from .comments import get_comments_for_restaurants
+from .trending import record_regions
+from ..models import SearchCriteria
+from ..utils.db_utils import execute_query
+from ..utils.profiling import bind_to_request
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMMENTS_LIMIT = 5
+MAX_COMMENTS_LIMIT = 50
+
+# Pool for the batched SQLite queries only. The slow Yelp call runs in the
+# request thread, so in-flight searches can never starve other pages' DB work.
+_db_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="search-page-db")
+
+def _submit_db(fn, *args):
+    """Run a DB call on the pool, keeping it attached to the current request's trace."""
+    return _db_executor.submit(bind_to_request(fn), *args)
+
+def _lookup_user_id(api_key):
+    """Resolve an API key to a user ID, or None when the key is unknown."""
+    try:
+        row = execute_query("SELECT id FROM user WHERE api_key = ?", (api_key,))
+        return {"user_id": row["id"] if row else None}, 200
+    except sqlite3.Error as db_error:
+        logger.error(f"Database error in _lookup_user_id: {db_error}")
+        return {"error": str(db_error)}, 500
+
+def get_search_page(criteria: SearchCriteria, api_key=None, comments_limit=DEFAULT_COMMENTS_LIMIT):
+    """Search for restaurants and annotate the results with favorites and comments.
+
+    The API key lookup runs on the DB pool while the Yelp search runs in the
+    request thread. Then the favorite counts, the caller's favorite flags and
+    the first page of comments are each fetched with a single batched query,
+    concurrently on the DB pool. An unknown API key is treated as an anonymous
+    caller, so a stale key only loses the favorite flags instead of failing
+    the search.
+    """
+    if comments_limit < 1 or comments_limit > MAX_COMMENTS_LIMIT:
+        return {"error": f"Comments limit must be between 1 and {MAX_COMMENTS_LIMIT}."}, 400
+
+    user_future = _submit_db(_lookup_user_id, api_key) if api_key else None
+
+    result, status_code = search_restaurants(criteria)
+    if "error" in result:
+        return result, status_code
+
+    user_id = None
+    if user_future:
+        user, status_code = user_future.result()
+        if "error" in user:
+            return user, status_code
+        user_id = user["user_id"]
+
+    businesses = result.get("businesses", [])
+    restaurant_ids = [business["id"] for business in businesses]
+    _submit_db(record_regions, businesses)
+
+    counts_future = _submit_db(get_favorite_counts, restaurant_ids)
+    comments_future = _submit_db(get_comments_for_restaurants, restaurant_ids, comments_limit)
+    flags_future = _submit_db(get_favorite_flags, restaurant_ids, user_id) if user_id else None
+
+    counts, status_code = counts_future.result()
+    if "error" in counts:
+        return counts, status_code
+    comments, status_code = comments_future.result()
+    if "error" in comments:
+        return comments, status_code
+    flags = {}
+    if flags_future:
+        flag_result, status_code = flags_future.result()
+        if "error" in flag_result:
+            return flag_result, status_code
+        flags = flag_result["favorites"]
+
+    for business in businesses:
+        restaurant_id = business["id"]
+        business["favoriteCount"] = counts["counts"][restaurant_id]
+        business["isFavorite"] = flags.get(restaurant_id, False)
+        business["commentCount"] = comments["counts"][restaurant_id]
+        business["comments"] = comments["comments"][restaurant_id]
+
+    return result, 200
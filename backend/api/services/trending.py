@@ -0,0 +1,380 @@
+import sqlite3
+import logging
+import math
+import time
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from ..utils.db_utils import get_db_connection
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Half-life (seconds) of the decayed score served for each trending window
+WINDOW_HALF_LIVES = {
+    "hour": 60 * 60,
+    "day": 24 * 60 * 60,
+    "week": 7 * 24 * 60 * 60,
+}
+# Bucket sizes (seconds) for the raw favorite/comment counts
+BUCKET_GRANULARITIES = {
+    "hourly": 60 * 60,
+    "daily": 24 * 60 * 60,
+}
+# How long (seconds) buckets of each granularity are kept before being pruned
+BUCKET_RETENTION = {
+    "hourly": max(WINDOW_HALF_LIVES.values()),
+    "daily": 90 * 24 * 60 * 60,
+}
+# Seconds between prunes of expired buckets
+BUCKET_PRUNE_INTERVAL = 60 * 60
+EVENT_WEIGHTS = {"favorite": 2.0, "comment": 1.0}
+EVENT_COLUMNS = {"favorite": "favorite_count", "comment": "comment_count"}
+# Events for restaurants with an unknown city only land in the global region
+GLOBAL_REGION = ""
+# Number of restaurants kept in the precomputed top-k per region and window
+TOP_K_CAPACITY = 100
+# Restaurants whose stored region is cached to skip redundant writes
+KNOWN_REGIONS_CAPACITY = 100_000
+# Seconds between reads checking whether a backfill rebuilt the scores
+GENERATION_CHECK_INTERVAL = 10
+
+def normalize_region(location):
+    """Normalize a city or "City, State" string into a region key.
+
+    Only the city part is kept, so "San Francisco, CA" and "san francisco" map
+    to the same region. Zip codes, addresses and abbreviations are not resolved.
+    """
+    city = (location or "").split(",")[0]
+    return " ".join(city.split()).lower()
+
+def region_of(restaurant):
+    """Extract the region key from a Yelp business payload."""
+    return normalize_region((restaurant.get("location") or {}).get("city"))
+
+def _log_add(log_a, log_b):
+    """Return log(exp(log_a) + exp(log_b)) without overflowing."""
+    if log_a is None:
+        return log_b
+    high, low = max(log_a, log_b), min(log_a, log_b)
+    return high + math.log1p(math.exp(low - high))
+
+class TrendingIndex:
+    """Forward-decayed scores with a bounded, sorted top-k per region and window.
+
+    Scores are kept as log(sum(weight * exp(decay * event_time))), so the
+    relative order of restaurants never changes as time passes and a write only
+    has to reposition the restaurant it touches. Since scores only grow, a
+    restaurant that falls out of the bounded top-k can only come back through
+    its own write, which keeps the bounded list exact.
+    """
+
+    def __init__(self, capacity=TOP_K_CAPACITY):
+        self.capacity = capacity
+        self._scores = {}  # (region, window) -> {restaurant_id: log_score}
+        self._top = {}  # (region, window) -> sorted [(-log_score, restaurant_id)]
+        self._lock = threading.Lock()
+
+    def add(self, region, window, restaurant_id, weight, timestamp):
+        """Fold one weighted event into a restaurant's score and return the new log score."""
+        decay = math.log(2) / WINDOW_HALF_LIVES[window]
+        key = (region, window)
+        with self._lock:
+            scores = self._scores.setdefault(key, {})
+            old = scores.get(restaurant_id)
+            new = _log_add(old, math.log(weight) + decay * timestamp)
+            scores[restaurant_id] = new
+            self._reposition(key, restaurant_id, old, new)
+        return new
+
+    def load(self, region, window, restaurant_id, log_score):
+        """Seed a persisted log score, keeping the higher one if already present."""
+        key = (region, window)
+        with self._lock:
+            scores = self._scores.setdefault(key, {})
+            old = scores.get(restaurant_id)
+            if old is not None and old >= log_score:
+                return
+            scores[restaurant_id] = log_score
+            self._reposition(key, restaurant_id, old, log_score)
+
+    def top(self, region, window, k, now=None):
+        """Return up to k (restaurant_id, current_score) pairs, best first."""
+        now = time.time() if now is None else now
+        decay = math.log(2) / WINDOW_HALF_LIVES[window]
+        with self._lock:
+            entries = self._top.get((region, window), [])[:k]
+        return [(restaurant_id, math.exp(-neg_log_score - decay * now))
+                for neg_log_score, restaurant_id in entries]
+
+    def entries(self):
+        """Yield every (region, window, restaurant_id, log_score) held by the index."""
+        with self._lock:
+            items = [(region, window, restaurant_id, log_score)
+                     for (region, window), scores in self._scores.items()
+                     for restaurant_id, log_score in scores.items()]
+        yield from items
+
+    def _reposition(self, key, restaurant_id, old, new):
+        top = self._top.setdefault(key, [])
+        if old is not None:
+            idx = bisect_left(top, (-old, restaurant_id))
+            if idx < len(top) and top[idx] == (-old, restaurant_id):
+                del top[idx]
+        if len(top) < self.capacity or (-new, restaurant_id) < top[-1]:
+            insort(top, (-new, restaurant_id))
+            if len(top) > self.capacity:
+                top.pop()
+
+_index = TrendingIndex()
+_index_generation = None  # Generation of the persisted scores _index was loaded from
+_last_generation_check = 0.0
+_load_lock = threading.Lock()
+_known_regions = {}  # restaurant_id -> region already stored in trending_restaurant
+_last_bucket_prune = 0.0
+
+def _sync_index(conn):
+    """Reload the in-memory index if the persisted scores were rebuilt by a backfill."""
+    global _index, _index_generation, _last_generation_check
+    with _load_lock:
+        _last_generation_check = time.monotonic()
+        row = conn.execute("SELECT generation FROM trending_state WHERE id = 1").fetchone()
+        generation = row["generation"] if row else 0
+        if generation == _index_generation:
+            return
+        index = TrendingIndex()
+        rows = conn.execute(
+            "SELECT region, time_window, restaurant_id, log_score FROM trending_score"
+        )
+        for row in rows:
+            if row["time_window"] in WINDOW_HALF_LIVES:
+                index.load(row["region"], row["time_window"], row["restaurant_id"], row["log_score"])
+        _index = index
+        _index_generation = generation
+
+def _remember_regions(rows):
+    # Cheap bound on the cache: start over rather than track recency
+    if len(_known_regions) + len(rows) > KNOWN_REGIONS_CAPACITY:
+        _known_regions.clear()
+    _known_regions.update(rows)
+
+def _bucket_start(timestamp, size):
+    return int(timestamp // size) * size
+
+def _bucket_expired(granularity, bucket_start, now):
+    return bucket_start < now - BUCKET_RETENTION[granularity]
+
+def _prune_buckets(cursor, now):
+    """Delete buckets older than their retention, at most once per BUCKET_PRUNE_INTERVAL."""
+    global _last_bucket_prune
+    if now - _last_bucket_prune < BUCKET_PRUNE_INTERVAL:
+        return
+    _last_bucket_prune = now
+    cursor.executemany(
+        "DELETE FROM trending_bucket WHERE granularity = ? AND bucket_start < ?",
+        [(granularity, now - retention) for granularity, retention in BUCKET_RETENTION.items()]
+    )
+
+def record_regions(restaurants):
+    """Remember the region of each restaurant so later comments can be attributed to it.
+
+    Restaurants whose region is already known skip the database, so repeated
+    searches don't take SQLite's write lock.
+    """
+    regions = {r["id"]: region_of(r) for r in restaurants if r.get("id") and region_of(r)}
+    rows = [(restaurant_id, region) for restaurant_id, region in regions.items()
+            if _known_regions.get(restaurant_id) != region]
+    if not rows:
+        return
+    conn = get_db_connection()
+    try:
+        conn.executemany(
+            "INSERT OR REPLACE INTO trending_restaurant (restaurant_id, region) VALUES (?, ?)",
+            rows
+        )
+        conn.commit()
+        _remember_regions(rows)
+    except sqlite3.Error as e:
+        logger.error(f"Database error in record_regions: {e}")
+    finally:
+        conn.close()
+
+def record_event(restaurant_id, event_type, region=None, timestamp=None, user_id=None):
+    """Incrementally fold a favorite/comment event into the buckets and decayed scores.
+
+    A favorite only counts the first time a given user favorites a restaurant,
+    so unfavoriting and favoriting again can't inflate its score.
+    """
+    timestamp = time.time() if timestamp is None else timestamp
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        # Take the write lock before syncing so a backfill can't land in between
+        cursor.execute("BEGIN IMMEDIATE")
+        _sync_index(conn)
+
+        if event_type == "favorite":
+            cursor.execute(
+                "INSERT OR IGNORE INTO trending_favorite (user_id, restaurant_id, favorited_at) VALUES (?, ?, ?)",
+                (user_id, restaurant_id, timestamp)
+            )
+            if cursor.rowcount == 0:
+                conn.commit()
+                return
+
+        region = normalize_region(region)
+        if region:
+            if _known_regions.get(restaurant_id) != region:
+                cursor.execute(
+                    "INSERT OR REPLACE INTO trending_restaurant (restaurant_id, region) VALUES (?, ?)",
+                    (restaurant_id, region)
+                )
+        else:
+            row = cursor.execute(
+                "SELECT region FROM trending_restaurant WHERE restaurant_id = ?",
+                (restaurant_id,)
+            ).fetchone()
+            region = row["region"] if row else GLOBAL_REGION
+
+        column = EVENT_COLUMNS[event_type]
+        cursor.executemany(f"""
+            INSERT INTO trending_bucket (restaurant_id, granularity, bucket_start, {column})
+            VALUES (?, ?, ?, 1)
+            ON CONFLICT (restaurant_id, granularity, bucket_start)
+            DO UPDATE SET {column} = {column} + 1
+        """, [(restaurant_id, granularity, _bucket_start(timestamp, size))
+              for granularity, size in BUCKET_GRANULARITIES.items()])
+        _prune_buckets(cursor, time.time())
+
+        score_rows = []
+        for score_region in {GLOBAL_REGION, region}:
+            for window in WINDOW_HALF_LIVES:
+                log_score = _index.add(score_region, window, restaurant_id, EVENT_WEIGHTS[event_type], timestamp)
+                score_rows.append((score_region, window, restaurant_id, log_score))
+        # Scores only grow, so MAX keeps concurrent writers from persisting a stale value
+        cursor.executemany("""
+            INSERT INTO trending_score (region, time_window, restaurant_id, log_score)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (region, time_window, restaurant_id)
+            DO UPDATE SET log_score = MAX(log_score, excluded.log_score)
+        """, score_rows)
+        conn.commit()
+        if region:
+            _remember_regions([(restaurant_id, region)])
+    except sqlite3.Error as e:
+        # Trending is best-effort and must never fail the write that triggered it
+        logger.error(f"Database error in record_event: {e}")
+    finally:
+        if conn:
+            conn.close()
+
+def get_trending(location=None, window="day", limit=20):
+    """Get the top trending restaurants for a region from the precomputed top-k."""
+    if window not in WINDOW_HALF_LIVES:
+        return {"error": f"Invalid window. Must be one of: {', '.join(WINDOW_HALF_LIVES)}."}, 400
+    if limit < 1 or limit > TOP_K_CAPACITY:
+        return {"error": f"Limit must be between 1 and {TOP_K_CAPACITY}."}, 400
+    region = normalize_region(location)
+    if any(char.isdigit() for char in region):
+        return {"error": "Location must be a city name, e.g. \"San Francisco\" or \"San Francisco, CA\"."}, 400
+    try:
+        if _index_generation is None or time.monotonic() - _last_generation_check >= GENERATION_CHECK_INTERVAL:
+            conn = get_db_connection()
+            try:
+                _sync_index(conn)
+            finally:
+                conn.close()
+        restaurants = [
+            {"id": restaurant_id, "score": score}
+            for restaurant_id, score in _index.top(region, window, limit)
+        ]
+        return {"location": location, "window": window, "restaurants": restaurants}, 200
+    except sqlite3.Error as db_error:
+        logger.error(f"Database error in get_trending: {db_error}")
+        return {"error": str(db_error)}, 500
+
+def _parse_timestamp(value):
+    """Parse a SQLite CURRENT_TIMESTAMP value (UTC) into epoch seconds."""
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+
+def backfill_trending():
+    """Rebuild trending buckets and scores from the favorite and review tables.
+
+    Running servers pick up the rebuilt scores through the bumped generation:
+    writes reload before touching them, reads within GENERATION_CHECK_INTERVAL.
+    Favorites count once per user and restaurant, at the time record_event
+    stored in trending_favorite. The favorite table has no timestamp, so legacy
+    favorites without a stored time are stamped with the first backfill's time
+    and keep it on later runs. Regions come from trending_restaurant; events
+    for restaurants without a known region only count towards the global region.
+    """
+    global _index, _index_generation
+    now = time.time()
+    index = TrendingIndex()
+    buckets = {}
+    conn = get_db_connection()
+    try:
+        # Block writers while reading the source tables and replacing the scores
+        conn.execute("BEGIN IMMEDIATE")
+        regions = {
+            row["restaurant_id"]: row["region"]
+            for row in conn.execute("SELECT restaurant_id, region FROM trending_restaurant")
+        }
+        favorited_at = {
+            (row["user_id"], row["restaurant_id"]): row["favorited_at"]
+            for row in conn.execute("SELECT user_id, restaurant_id, favorited_at FROM trending_favorite")
+        }
+        for row in conn.execute("SELECT DISTINCT user_id, restaurant_id FROM favorite"):
+            favorited_at.setdefault((row["user_id"], row["restaurant_id"]), None)
+        legacy = [pair for pair, timestamp in favorited_at.items() if timestamp is None]
+        for pair in legacy:
+            favorited_at[pair] = now
+        events = [(restaurant_id, "favorite", timestamp)
+                  for (_, restaurant_id), timestamp in favorited_at.items()]
+        events += [(row["restaurant_id"], "comment", _parse_timestamp(row["commented_at"]))
+                   for row in conn.execute("SELECT restaurant_id, commented_at FROM review")]
+
+        for restaurant_id, event_type, timestamp in events:
+            for granularity, size in BUCKET_GRANULARITIES.items():
+                if _bucket_expired(granularity, _bucket_start(timestamp, size), now):
+                    continue
+                counts = buckets.setdefault((restaurant_id, granularity, _bucket_start(timestamp, size)), [0, 0])
+                counts[0 if event_type == "favorite" else 1] += 1
+            for score_region in {GLOBAL_REGION, regions.get(restaurant_id, GLOBAL_REGION)}:
+                for window in WINDOW_HALF_LIVES:
+                    index.add(score_region, window, restaurant_id, EVENT_WEIGHTS[event_type], timestamp)
+
+        conn.execute("DELETE FROM trending_bucket")
+        conn.execute("DELETE FROM trending_score")
+        conn.executemany("""
+            INSERT INTO trending_favorite (user_id, restaurant_id, favorited_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT (user_id, restaurant_id) DO UPDATE SET favorited_at = excluded.favorited_at
+        """, [(user_id, restaurant_id, now) for user_id, restaurant_id in legacy])
+        conn.executemany(
+            "INSERT INTO trending_bucket (restaurant_id, granularity, bucket_start, favorite_count, comment_count) VALUES (?, ?, ?, ?, ?)",
+            [(*key, favorite_count, comment_count) for key, (favorite_count, comment_count) in buckets.items()]
+        )
+        conn.executemany(
+            "INSERT INTO trending_score (region, time_window, restaurant_id, log_score) VALUES (?, ?, ?, ?)",
+            list(index.entries())
+        )
+        conn.execute("UPDATE trending_state SET generation = generation + 1 WHERE id = 1")
+        generation = conn.execute("SELECT generation FROM trending_state WHERE id = 1").fetchone()["generation"]
+        conn.commit()
+    finally:
+        conn.close()
+
+    with _load_lock:
+        _index = index
+        _index_generation = generation
+    logger.info(f"Backfilled trending data from {len(events)} events")
+    return len(events)
+
+if __name__ == "__main__":
+    backfill_trending()
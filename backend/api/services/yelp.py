@@ -1,7 +1,9 @@
 import requests
 import logging
+import time
 from ..config import YELP_API_KEY, YELP_API_BASE_URL
 from ..models import SearchCriteria
+from ..utils.profiling import record_external_call
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,6 +19,17 @@ def get_headers():
         "accept": "application/json"
     }
 
+def request_yelp(url, **kwargs):
+    """Send a GET request to the Yelp API, recording its timing for the profiler."""
+    start = time.perf_counter()
+    status_code = None
+    try:
+        response = requests.get(url, **kwargs)
+        status_code = response.status_code
+        return response
+    finally:
+        record_external_call(url, status_code, time.perf_counter() - start)
+
 def search_restaurants(criteria: SearchCriteria):
     """Search for restaurants using the Yelp API."""
     try:
@@ -35,7 +48,7 @@ def search_restaurants(criteria: SearchCriteria):
         
         logger.info(f"Searching Yelp with parameters: {params}")
         
-        response = requests.get(
+        response = request_yelp(
             url, 
             headers=get_headers(),
             params=params,
@@ -65,7 +78,7 @@ def get_restaurant_by_id(business_id):
         
     try:
         url = f"{YELP_API_BASE_URL}/businesses/{business_id}"
-        response = requests.get(
+        response = request_yelp(
             url, 
             headers=get_headers(),
             timeout=10
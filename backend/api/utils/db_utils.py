@@ -1,6 +1,8 @@
 import sqlite3
+import time
 from pathlib import Path
 import logging
+from .profiling import record_query
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,7 @@ def get_db_connection():
 def execute_query(query, params=(), fetch_all=False, commit=False):
     """Execute a database query with error handling."""
     conn = None
+    start = time.perf_counter()
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -32,6 +35,7 @@ def execute_query(query, params=(), fetch_all=False, commit=False):
         logger.error(f"Database error in execute_query: {e}")
         raise
     finally:
+        record_query(query, time.perf_counter() - start)
         if conn in locals():
             conn.close()
 
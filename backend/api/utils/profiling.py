@@ -0,0 +1,241 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+# Cap on SQL/Yelp calls kept per request so a runaway loop can't exhaust memory
+MAX_RECORDED_CALLS = 1000
+
+_current_trace = ContextVar("current_trace", default=None)
+
+class RequestTrace:
+    """Timings, SQL, Yelp calls and stack samples collected for one request."""
+
+    def __init__(self, method, path, sampled):
+        self.method = method
+        self.path = path
+        self.sampled = sampled  # Picked by the sample rate before the request ran
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.duration_ms = None
+        self.status_code = None
+        self.threads = set()
+        self.samples = Counter()
+        self.queries = []
+        self.yelp_calls = []
+        self.dropped_calls = 0
+        self.trace_file = None
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.start) * 1000
+
+    def add_call(self, calls, call):
+        if len(self.queries) + len(self.yelp_calls) >= MAX_RECORDED_CALLS:
+            self.dropped_calls += 1
+        else:
+            calls.append(call)
+
+    def summary(self):
+        """Return the request breakdown as a JSON-serializable dict."""
+        sql_ms = sum(q["duration_ms"] for q in self.queries)
+        yelp_ms = sum(c["duration_ms"] for c in self.yelp_calls)
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "sampled": self.sampled,
+            "sql": {"count": len(self.queries), "total_ms": sql_ms, "queries": self.queries},
+            "yelp": {"count": len(self.yelp_calls), "total_ms": yelp_ms, "calls": self.yelp_calls},
+            # Calls made in parallel can add up to more than the request took
+            "other_ms": max(self.duration_ms - sql_ms - yelp_ms, 0),
+            "dropped_calls": self.dropped_calls,
+            "trace_file": self.trace_file,
+        }
+
+def record_query(sql, duration):
+    """Record an executed SQL statement against the current request, if it is traced."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_call(trace.queries, {"sql": " ".join(sql.split()), "duration_ms": duration * 1000})
+
+def record_external_call(url, status_code, duration):
+    """Record a Yelp API call against the current request, if it is traced."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_call(trace.yelp_calls, {"url": url, "status_code": status_code, "duration_ms": duration * 1000})
+
+@contextmanager
+def track_current_thread():
+    """Make the current thread's stack visible to the sampler for the traced request."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    ident = threading.get_ident()
+    trace.threads.add(ident)
+    try:
+        yield
+    finally:
+        trace.threads.discard(ident)
+
+def bind_to_request(fn):
+    """Wrap fn so it runs in the caller's request context when handed to another thread."""
+    context = copy_context()
+
+    def run(*args, **kwargs):
+        def tracked():
+            with track_current_thread():
+                return fn(*args, **kwargs)
+        return context.run(tracked)
+    return run
+
+class ProfiledRoute(APIRoute):
+    """Route that registers the thread running each endpoint with the request's trace."""
+
+    def __init__(self, path, endpoint, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint):
+            @wraps(endpoint)
+            async def tracked_endpoint(*args, **kw):
+                with track_current_thread():
+                    return await endpoint(*args, **kw)
+        else:
+            @wraps(endpoint)
+            def tracked_endpoint(*args, **kw):
+                with track_current_thread():
+                    return endpoint(*args, **kw)
+        super().__init__(path, tracked_endpoint, **kwargs)
+
+def _fold_stack(frame):
+    """Render a frame and its callers as a root-first folded stack line."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+class Profiler:
+    """Opt-in request profiler with a statistical stack sampler.
+
+    Every in-flight request has its endpoint threads sampled from the start:
+    a sample_rate fraction every interval_ms, the rest every
+    background_interval_ms to keep overhead low. Requests that were neither
+    sampled nor slower than slow_threshold_ms discard their samples when they
+    finish. Sampled and slow requests are written to trace_dir as a folded-stack file (for flamegraph.pl/speedscope) plus a JSON
+    breakdown, keeping only the newest max_traces. Only those traces are kept in
+    memory for get_slow_requests; other requests drop their breakdown once done.
+    """
+
+    def __init__(self, sample_rate, slow_threshold_ms, interval_ms, background_interval_ms,
+                 trace_dir, max_traces, admin_key=None):
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.interval = interval_ms / 1000
+        # Unsampled requests are only sampled on every Nth tick of the sampler
+        self.background_every = max(1, round(background_interval_ms / interval_ms))
+        self.trace_dir = Path(trace_dir)
+        self.max_traces = max_traces
+        self.admin_key = admin_key
+        self._recent = deque(maxlen=max_traces)
+        self._active = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._sampler = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="profiler-writer")
+
+    @contextmanager
+    def trace(self, method, path):
+        """Trace a request for the duration of the with block."""
+        trace = RequestTrace(method, path, random.random() < self.sample_rate)
+        token = _current_trace.set(trace)
+        with self._lock:
+            self._active.add(trace)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+                self._sampler.start()
+        self._wakeup.set()
+        try:
+            yield trace
+        finally:
+            trace.duration_ms = trace.elapsed_ms()
+            _current_trace.reset(token)
+            with self._lock:
+                self._active.discard(trace)
+            if trace.sampled or trace.duration_ms >= self.slow_threshold_ms:
+                self._recent.append(trace)
+                self._writer.submit(self._write, trace)
+            else:
+                trace.samples = Counter()
+
+    def get_slow_requests(self, limit, admin_key):
+        """Get the slowest recently traced (sampled or slow) requests with their breakdown."""
+        if not self.admin_key:
+            return {"error": "Profiling admin key is not configured."}, 403
+        # Compare bytes: compare_digest raises TypeError on non-ASCII str
+        if not admin_key or not secrets.compare_digest(admin_key.encode(), self.admin_key.encode()):
+            return {"error": "Invalid admin key."}, 401
+        if limit < 1:
+            return {"error": "Limit must be at least 1."}, 400
+        traces = sorted(list(self._recent), key=lambda t: t.duration_ms, reverse=True)[:limit]
+        return {"requests": [trace.summary() for trace in traces]}, 200
+
+    def _sample_loop(self):
+        tick = 0
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                traces = list(self._active)
+            if not traces:
+                self._wakeup.wait()
+                continue
+
+            tick += 1
+            frames = None
+            for trace in traces:
+                if not trace.sampled and tick % self.background_every:
+                    continue
+                if frames is None:
+                    frames = sys._current_frames()
+                for ident in list(trace.threads):
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        trace.samples[_fold_stack(frame)] += 1
+            frames = None
+            time.sleep(self.interval)
+
+    def _write(self, trace):
+        try:
+            self.trace_dir.mkdir(parents=True, exist_ok=True)
+            name = trace.path.strip("/").replace("/", "_") or "root"
+            stem = f"{trace.started_at.strftime('%Y%m%dT%H%M%S%f')}_{trace.method}_{name}"
+            trace.trace_file = f"{stem}.folded"
+            with open(self.trace_dir / trace.trace_file, "w") as f:
+                for stack, count in trace.samples.items():
+                    f.write(f"{stack} {count}\n")
+            with open(self.trace_dir / f"{stem}.json", "w") as f:
+                json.dump(trace.summary(), f, indent=2)
+            trace.samples = Counter()
+
+            # Rotate, keeping only the newest traces
+            for old in sorted(self.trace_dir.glob("*.json"))[:-self.max_traces]:
+                old.unlink(missing_ok=True)
+                old.with_suffix(".folded").unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to write profiling trace: {e}")
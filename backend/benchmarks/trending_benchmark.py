@@ -0,0 +1,48 @@
+"""Benchmark the in-memory trending index against a synthetic event stream.
+
+Run from the backend directory:
+    python -m benchmarks.trending_benchmark --events 10000000
+"""
+import argparse
+import random
+import time
+from api.services.trending import TrendingIndex, WINDOW_HALF_LIVES, EVENT_WEIGHTS, GLOBAL_REGION
+
+def run(events, restaurants, regions, k, seed):
+    rng = random.Random(seed)
+    index = TrendingIndex()
+    restaurant_ids = [f"restaurant-{i}" for i in range(restaurants)]
+    restaurant_regions = {r: f"region-{rng.randrange(regions)}" for r in restaurant_ids}
+    event_types = list(EVENT_WEIGHTS)
+    start_time = time.time() - 7 * 24 * 60 * 60
+    step = (7 * 24 * 60 * 60) / events
+
+    started = time.perf_counter()
+    for i in range(events):
+        # Skew popularity so a small set of restaurants dominates, as in real traffic
+        restaurant_id = restaurant_ids[int(restaurants * rng.random() ** 3)]
+        weight = EVENT_WEIGHTS[event_types[i & 1]]
+        timestamp = start_time + i * step
+        for region in (GLOBAL_REGION, restaurant_regions[restaurant_id]):
+            for window in WINDOW_HALF_LIVES:
+                index.add(region, window, restaurant_id, weight, timestamp)
+    write_seconds = time.perf_counter() - started
+
+    queries = 10000
+    started = time.perf_counter()
+    for i in range(queries):
+        index.top(f"region-{i % regions}", "day", k)
+    query_seconds = time.perf_counter() - started
+
+    print(f"events:  {events:,} ({events / write_seconds:,.0f} events/s, {write_seconds:.1f}s)")
+    print(f"queries: {queries:,} top-{k} reads ({query_seconds / queries * 1e6:.1f} us/query)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the trending index.")
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--restaurants", type=int, default=100_000)
+    parser.add_argument("--regions", type=int, default=50)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.events, args.restaurants, args.regions, args.k, args.seed)
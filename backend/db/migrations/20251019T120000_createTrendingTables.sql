@@ -0,0 +1,21 @@
+CREATE TABLE trending_restaurant (
+    restaurant_id VARCHAR(255) PRIMARY KEY,
+    region VARCHAR(255) NOT NULL
+);
+
+CREATE TABLE trending_bucket (
+    restaurant_id VARCHAR(255) NOT NULL,
+    granularity VARCHAR(16) NOT NULL,
+    bucket_start INTEGER NOT NULL,
+    favorite_count INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (restaurant_id, granularity, bucket_start)
+);
+
+CREATE TABLE trending_score (
+    region VARCHAR(255) NOT NULL,
+    time_window VARCHAR(16) NOT NULL,
+    restaurant_id VARCHAR(255) NOT NULL,
+    log_score REAL NOT NULL,
+    PRIMARY KEY (region, time_window, restaurant_id)
+);
@@ -0,0 +1,5 @@
+CREATE TABLE trending_favorite (
+    user_id VARCHAR(255) NOT NULL,
+    restaurant_id VARCHAR(255) NOT NULL,
+    PRIMARY KEY (user_id, restaurant_id)
+);
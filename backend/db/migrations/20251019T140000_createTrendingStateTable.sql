@@ -0,0 +1,6 @@
+CREATE TABLE trending_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL
+);
+
+INSERT INTO trending_state (id, generation) VALUES (1, 0);
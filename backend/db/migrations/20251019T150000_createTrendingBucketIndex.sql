@@ -0,0 +1 @@
+CREATE INDEX trending_bucket_granularity_start ON trending_bucket (granularity, bucket_start);
@@ -0,0 +1 @@
+ALTER TABLE trending_favorite ADD COLUMN favorited_at REAL;
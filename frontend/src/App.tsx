@@ -100,6 +100,7 @@ function App() {
     isAttributeSelected: restaurants.isAttributeSelected,
     toggleFavorite: restaurants.toggleFavorite,
     toggleComments: restaurants.toggleComments,
+    addComment: restaurants.addComment,
     isAuthenticated: auth.isAuthenticated,
     navigateToLogin,
     handleHomeClick
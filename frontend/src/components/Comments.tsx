@@ -7,12 +7,16 @@ interface CommentsProps {
   restaurantId: string;
   isAuthenticated: boolean;
   onLogin: () => void;
+  initialComments?: Comment[]; // First page of comments, e.g. from the search page response
+  totalCount?: number; // Total number of comments, to tell whether more can be loaded
+  onCommentAdded?: (comment: Comment) => void;
 }
 
-const Comments = ({ restaurantId, isAuthenticated, onLogin }: CommentsProps) => {
-  const [comments, setComments] = useState<Comment[]>([]);
+const Comments = ({ restaurantId, isAuthenticated, onLogin, initialComments, totalCount, onCommentAdded }: CommentsProps) => {
+  const [comments, setComments] = useState<Comment[]>(initialComments || []);
   const [newComment, setNewComment] = useState<string>('');
-  const [loading, setLoading] = useState<boolean>(true);
+  const [loading, setLoading] = useState<boolean>(!initialComments);
+  const [hasMore, setHasMore] = useState<boolean>(false);
   const [error, setError] = useState<string>('');
   const [submitting, setSubmitting] = useState<boolean>(false);
 
@@ -21,6 +25,7 @@ const Comments = ({ restaurantId, isAuthenticated, onLogin }: CommentsProps) =>
       setLoading(true);
       const response = await axios.get(`/api/comments/${restaurantId}`);
       setComments(response.data.comments || []);
+      setHasMore(false);
       setError('');
     } catch (err) {
       console.error('Error fetching comments:', err);
@@ -31,9 +36,15 @@ const Comments = ({ restaurantId, isAuthenticated, onLogin }: CommentsProps) =>
     }
   };
 
-  // Fetch comments when component mounts or restaurantId changes
+  // Use the seeded first page when available, otherwise fetch all comments
   useEffect(() => {
-    fetchComments();
+    if (initialComments) {
+      setComments(initialComments);
+      setHasMore((totalCount || 0) > initialComments.length);
+      setLoading(false);
+    } else {
+      fetchComments();
+    }
   }, [restaurantId]);
 
   const handleSubmit = async (e: FormEvent) => {
@@ -58,6 +69,7 @@ const Comments = ({ restaurantId, isAuthenticated, onLogin }: CommentsProps) =>
       
       // Add the new comment to the top of the list
       setComments([response.data, ...comments]);
+      onCommentAdded?.(response.data);
       setNewComment('');
       setError('');
     } catch (err) {
@@ -108,6 +120,11 @@ const Comments = ({ restaurantId, isAuthenticated, onLogin }: CommentsProps) =>
         ) : (
           <div className="no-comments">No comments yet. Be the first to comment!</div>
         )}
+        {!loading && hasMore && (
+          <button type="button" className="comments-load-more" onClick={fetchComments}>
+            Show all {totalCount} comments
+          </button>
+        )}
       </div>
     </div>
   );
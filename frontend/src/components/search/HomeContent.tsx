@@ -13,6 +13,7 @@ const HomeContent: React.FC<HomeContentProps> = ({
   isAttributeSelected,
   toggleFavorite,
   toggleComments,
+  addComment,
   isAuthenticated,
   navigateToLogin,
   handleHomeClick
@@ -39,6 +40,7 @@ const HomeContent: React.FC<HomeContentProps> = ({
         hasSearched={hasSearched}
         toggleFavorite={toggleFavorite}
         toggleComments={toggleComments}
+        addComment={addComment}
         isAuthenticated={isAuthenticated}
         navigateToLogin={navigateToLogin}
       />
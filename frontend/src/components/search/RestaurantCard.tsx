@@ -1,5 +1,5 @@
 import React from 'react';
-import { Restaurant } from '../../types';
+import { Restaurant, Comment } from '../../types';
 import { formatFavoriteCount } from '../../utils/helpers';
 import Comments from '../Comments';
 
@@ -7,6 +7,7 @@ interface RestaurantCardProps {
   restaurant: Restaurant;
   toggleFavorite: (restaurant: Restaurant) => void;
   toggleComments: (restaurantId: string) => void;
+  addComment: (restaurantId: string, comment: Comment) => void;
   isAuthenticated: boolean;
   onLogin: () => void;
 }
@@ -15,6 +16,7 @@ const RestaurantCard: React.FC<RestaurantCardProps> = ({
   restaurant,
   toggleFavorite,
   toggleComments,
+  addComment,
   isAuthenticated,
   onLogin
 }) => {
@@ -78,6 +80,9 @@ const RestaurantCard: React.FC<RestaurantCardProps> = ({
               restaurantId={restaurant.id} 
               isAuthenticated={isAuthenticated}
               onLogin={onLogin}
+              initialComments={restaurant.comments}
+              totalCount={restaurant.commentCount}
+              onCommentAdded={comment => addComment(restaurant.id, comment)}
             />
           </div>
         )}
@@ -1,5 +1,5 @@
 import React from 'react';
-import { Restaurant } from '../../types';
+import { Restaurant, Comment } from '../../types';
 import RestaurantCard from './RestaurantCard';
 
 interface ResultsListProps {
@@ -9,6 +9,7 @@ interface ResultsListProps {
   hasSearched: boolean;
   toggleFavorite: (restaurant: Restaurant) => void;
   toggleComments: (restaurantId: string) => void;
+  addComment: (restaurantId: string, comment: Comment) => void;
   isAuthenticated: boolean;
   navigateToLogin: () => void;
 }
@@ -20,6 +21,7 @@ const ResultsList: React.FC<ResultsListProps> = ({
   hasSearched,
   toggleFavorite,
   toggleComments,
+  addComment,
   isAuthenticated,
   navigateToLogin
 }) => {
@@ -38,6 +40,7 @@ const ResultsList: React.FC<ResultsListProps> = ({
               restaurant={restaurant}
               toggleFavorite={toggleFavorite}
               toggleComments={toggleComments}
+              addComment={addComment}
               isAuthenticated={isAuthenticated}
               onLogin={navigateToLogin}
             />
@@ -1,7 +1,7 @@
 import { useState, useEffect, FormEvent } from 'react';
 import axios from 'axios';
 import { useNavigate } from 'react-router-dom';
-import { SearchCriteria, Restaurant, SearchResponse } from '../types';
+import { SearchCriteria, Restaurant, SearchResponse, Comment } from '../types';
 import { kmToMeters } from '../utils/helpers';
 import { API_KEY_NAME } from './useAuth';
 
@@ -19,6 +19,7 @@ export interface UseRestaurantsReturn {
   handleSearch: (e: FormEvent) => Promise<void>;
   toggleFavorite: (restaurant: Restaurant) => Promise<void>;
   toggleComments: (restaurantId: string) => void;
+  addComment: (restaurantId: string, comment: Comment) => void;
   fetchFavorites: () => Promise<void>;
   setError: (error: string) => void;
 }
@@ -171,6 +172,21 @@ export function useRestaurants(isAuthenticated: boolean): UseRestaurantsReturn {
     );
   };
 
+  // Keep the seeded comments in sync so reopening a card shows new comments
+  const addComment = (restaurantId: string, comment: Comment) => {
+    setResults(prevResults => 
+      prevResults.map(restaurant => 
+        restaurant.id === restaurantId 
+          ? { 
+              ...restaurant, 
+              comments: [comment, ...(restaurant.comments || [])],
+              commentCount: (restaurant.commentCount || 0) + 1
+            }
+          : restaurant
+      )
+    );
+  };
+
   // Handle input changes
   const handleInputChange = (e: React.ChangeEvent<HTMLInputElement | HTMLSelectElement>) => {
     const { name, value, type } = e.target as HTMLInputElement;
@@ -255,35 +271,15 @@ export function useRestaurants(isAuthenticated: boolean): UseRestaurantsReturn {
     setHasSearched(true); 
 
     try {
-      const response = await axios.post<SearchResponse>('/api/search', criteria);
-      
-      // Mark favorites in the results
-      const favIds = favorites.map(fav => fav.id);
-      const markedResults = response.data.businesses.map(business => ({
-        ...business,
-        isFavorite: favIds.includes(business.id)
-      }));
-      
-      setResults(markedResults);
-      
-      // Fetch favorite counts for the results
-      if (markedResults.length > 0) {
-        const restaurantIds = markedResults.map(restaurant => restaurant.id);
-        try {
-          const countsResponse = await axios.post('/api/favorites/counts', restaurantIds);
-          const counts = countsResponse.data.counts || {};
-          
-          // Update results with favorite counts
-          setResults(prevResults => 
-            prevResults.map(restaurant => ({
-              ...restaurant,
-              favoriteCount: counts[restaurant.id] || 0
-            }))
-          );
-        } catch (countErr) {
-          console.error('Error fetching favorite counts:', countErr);
+      // Results come back already annotated with favorite counts, favorite flags and comments
+      const response = await axios.post<SearchResponse>('/api/search/page', criteria, {
+        headers: {
+          'Content-Type': 'application/json',
+          'apiKey': isAuthenticated ? localStorage.getItem(API_KEY_NAME) || '' : '',
         }
-      }
+      });
+      
+      setResults(response.data.businesses);
     } catch (err: any) {
       console.error('Error fetching results:', err);
       // Handle axios errors specifically
@@ -311,6 +307,7 @@ export function useRestaurants(isAuthenticated: boolean): UseRestaurantsReturn {
     handleSearch,
     toggleFavorite,
     toggleComments,
+    addComment,
     fetchFavorites,
     setError
   };
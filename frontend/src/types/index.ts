@@ -32,6 +32,7 @@ export interface Restaurant {
   isFavorite?: boolean; 
   favoriteCount?: number; 
   commentCount?: number;
+  comments?: Comment[];
   showComments?: boolean;
 }
 
@@ -73,6 +74,7 @@ export interface HomeContentProps {
   isAttributeSelected: (attr: string) => boolean;
   toggleFavorite: (restaurant: Restaurant) => void;
   toggleComments: (restaurantId: string) => void;
+  addComment: (restaurantId: string, comment: Comment) => void;
   isAuthenticated: boolean;
   navigateToLogin: () => void;
   handleHomeClick: () => void;